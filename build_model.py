@@ -0,0 +1,18 @@
+"""
+One-time helper: save a trimmed copy of en_core_web_sm to models/en_task_sm.
+
+Only the components parse_task needs are kept (tok2vec, tagger, parser, attribute_ruler),
+so loading it skips deserializing NER/lemmatizer/senter. parser.load_nlp() uses it automatically
+when the folder exists and falls back to en_core_web_sm otherwise.
+
+Run once after `python -m spacy download en_core_web_sm`:
+    python build_model.py
+"""
+
+import spacy
+from parser import MODEL_DIR, UNUSED_PIPES
+
+if __name__ == "__main__":
+    nlp = spacy.load('en_core_web_sm', exclude=UNUSED_PIPES)
+    nlp.to_disk(MODEL_DIR)
+    print("Saved pipeline", nlp.pipe_names, "to", MODEL_DIR)
@@ -1,5 +1,6 @@
 """
 dateparser handles natural language dates (tomorrow, next Tue, in 3 days, etc.). We set RELATIVE_BASE so parsing is anchored to the current time.
+The most common phrases (today, tomorrow, next Tue, in 3 days, ISO dates) are resolved by a regex fast path (DATE_FAST_RE) first, dateparser only runs when it misses, on just the date-looking span (DATE_SPAN_RE) when one is found.
 
 regex (TIME_RE) finds patterns like 2h, 30min, 45 minutes.
 
@@ -7,75 +8,226 @@ spaCy is used to extract noun chunks (best short human titles).
 
 Importance is inferred from short keyword lists (high/medium/low). You can also let users explicitly tag importance in the UI.
 
-The function returns a dictionary with parsed fields you can feed into the prioritizer."""
+The function returns a Task (frozen, slotted dataclass) with parsed fields you can feed into the prioritizer."""
 
+import os
 import re
-from datetime import datetime
-import dateparser
-import spacy
+import calendar
+import functools
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 
 # ============= Load mmodel ================
-nlp = spacy.load('en_core_web_sm')
+# spaCy and dateparser take seconds to import/load, so they are only pulled in
+# on first use (CSV-only flows or plain imports of this module stay fast)
+_nlp = None
+_dateparser = None
 
-# ============== regrex to capture time expression =================
-TIME_RE = re.compile(r'(\d+)\s*(h|hr|hour|hours|m|min|minute|minutes)\b', re.IGNORECASE)
+# components parse_task never reads; it only needs tagger/parser/attribute_ruler (noun_chunks + tok.pos_)
+UNUSED_PIPES = ['ner', 'lemmatizer', 'senter']
+# trimmed copy of en_core_web_sm written by build_model.py, loaded instead when present
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'en_task_sm')
+
+def load_nlp():
+    """Load a fresh spaCy pipeline for task parsing.
+    Prefers the trimmed model in MODEL_DIR; otherwise loads en_core_web_sm without
+    the unused components (excluded, so they are not even deserialized).
+    """
+    import spacy
+    if os.path.isdir(MODEL_DIR):
+        return spacy.load(MODEL_DIR)
+    return spacy.load('en_core_web_sm', exclude=UNUSED_PIPES)
+
+def get_nlp():
+    """Return the shared spaCy pipeline, loading it on first call."""
+    global _nlp
+    if _nlp is None:
+        _nlp = load_nlp()
+    return _nlp
+
+def pipe_by_length(nlp, texts, batch_size=64):
+    """nlp.pipe over texts in length order (similar-sized minibatches), docs returned in input order."""
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    docs = [None] * len(texts)
+    for i, doc in zip(order, nlp.pipe([texts[i] for i in order], batch_size=batch_size)):
+        docs[i] = doc
+    return docs
+
+def _get_dateparser():
+    global _dateparser
+    if _dateparser is None:
+        import dateparser
+        _dateparser = dateparser
+    return _dateparser
+
+# ============== fast path for common due date phrases =================
+# today/tomorrow, next|by|on|this <weekday>, in N days|weeks|months, ISO dates.
+# Resolved with plain datetime arithmetic, dateparser is only used when this misses.
+# Like the other task regexes below it is case-sensitive: it runs on text.lower()
+DATE_FAST_RE = re.compile(
+    r'\b(?:(?P<day>today|tonight|tomorrow)'
+    r'|(?:next|by|on|this)\s+(?P<wd>mon|tue|wed|thu|fri|sat|sun)(?:day|sday|s|nesday|rsday|rs|r|urday)?'
+    r'|in\s+(?P<n>\d+)\s+(?P<unit>day|week|month)s?'
+    r'|(?P<iso>\d{4}-\d{2}-\d{2}))\b')
+WEEKDAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+
+# ============== date span handed to dateparser when the fast path misses ==========
+# dateparser gets much slower with longer input, so only the date-looking part of
+# the task is passed to it (e.g. "March 5th" instead of the whole sentence)
+_MONTHS = (r'(?:january|february|march|april|may|june|july|august|september|october|november|december'
+           r'|jan|feb|mar|apr|jun|jul|aug|sept|sep|oct|nov|dec)\.?')
+# bare "5 may" / "1/2" are too often amounts or fractions ("buy 2 may flowers",
+# "review 1/2 of the doc"), so they only count right after a cue word or with a year
+_DATE_CUE = r'(?:(?<=\bon )|(?<=\bby )|(?<=\bdue )|(?<=\bbefore )|(?<=\buntil ))'
+_DAY_MONTH = r'\d{1,2}(?:st|nd|rd|th)?\s+(?:of\s+)?' + _MONTHS
+# numeric dates use '/' only ('.' would catch decimals like "1.5 hours" / "version 2.3"),
+# and never when followed by more digits or a unit / number word ("3/4 hours", "2/3 of")
+_NUM_DATE_END = (r'(?![\d/]|\s*%|\s*(?:of|percent|h|hrs?|hours?|m|mins?|minutes?|days?|weeks?'
+                 r'|months?|years?|k|thousand|million|billion)\b)')
+DATE_SPAN_RE = re.compile(
+    r'\b(?:(?:next|this|last|coming)\s+(?:week|weekend|month|year)'
+    r'|end\s+of\s+(?:the\s+)?(?:day|week|month|year)'
+    r'|' + _MONTHS + r'\s+\d{1,2}(?:st|nd|rd|th)?(?:,?\s+\d{4})?'
+    r'|' + _DAY_MONTH + r',?\s+\d{4}'
+    r'|' + _DATE_CUE + _DAY_MONTH +
+    r'|\d{1,2}/\d{1,2}/\d{2,4}' + _NUM_DATE_END +
+    r'|' + _DATE_CUE + r'\d{1,2}/\d{1,2}' + _NUM_DATE_END +
+    r'|monday|tuesday|wednesday|thursday|friday|saturday|sunday'
+    r'|in\s+\d+\s+(?:hour|year)s?)\b')
+
+def _add_months(d, n):
+    month = d.month - 1 + n
+    year = d.year + month // 12
+    month = month % 12 + 1
+    day = min(d.day, calendar.monthrange(year, month)[1])
+    return d.replace(year=year, month=month, day=day)
+
+def fast_parse_due(text, reference):
+    """Resolve common due date phrases in (lowercased) text against reference, None if nothing matched."""
+    m = DATE_FAST_RE.search(text)
+    if not m:
+        return None
+    # out-of-range results ("in 3000000 days", bad ISO dates) mean no due date, like a dateparser miss
+    try:
+        if m.group('day'):
+            word = m.group('day')
+            return reference + timedelta(days=1) if word == 'tomorrow' else reference
+        if m.group('wd'):
+            # always the upcoming weekday (1..7 days ahead), like PREFER_DATES_FROM future
+            ahead = (WEEKDAYS.index(m.group('wd')) - reference.weekday() - 1) % 7 + 1
+            return reference + timedelta(days=ahead)
+        if m.group('n'):
+            n = int(m.group('n'))
+            unit = m.group('unit')
+            if unit == 'month':
+                return _add_months(reference, n)
+            return reference + timedelta(days=n * 7 if unit == 'week' else n)
+        return datetime.strptime(m.group('iso'), '%Y-%m-%d')
+    except (OverflowError, ValueError):
+        return None
+
+# ============== regrex to capture time expression (on lowercased text) =================
+TIME_RE = re.compile(r'(\d+)\s*(h|hr|hour|hours|m|min|minute|minutes)\b')
+# ============== title cleanup: (...) / [...] first, then trailling ", ~2h ..." ==========
+# two passes on purpose: a trailing fragment can only show up once brackets are gone
+# ("Email Bob, (re: budget) 2h" -> "Email Bob")
+TITLE_BRACKETS_RE = re.compile(r'\(.*?\)|\[.*?\]')
+TITLE_TRAILING_RE = re.compile(r',\s*~?\d+\s*(?:h|hr|hour|m|min).*', re.IGNORECASE)
 # ============== Keywords for Importance ===================
 HIGH_WORDS = ('urgent', 'asap', 'immediately', 'high', 'important', 'priority')
 MED_WORDS = {'medium', 'normal', 'typical'}
 LOW_WORDS = {'low', 'later', 'someday'}
+# all keyword classes folded into one alternation so the text is scanned once
+IMP_RE = re.compile(r'(?P<H>%s)|(?P<M>%s)|(?P<L>%s)' % tuple(
+    '|'.join(sorted(words)) for words in (HIGH_WORDS, MED_WORDS, LOW_WORDS)))
+
+@dataclass(frozen=True, slots=True)
+class Task:
+    """A parsed task. Frozen + slotted: small per task and safe to share from the cache."""
+    raw: str
+    title: str
+    due: datetime | None
+    est_minutes: int | None
+    importance: int | None
 
-def parse_task(text, reference=None):
-    """Parse a task string and return a dict
-    {'raw' : original text, 'title' : short title, 'due' : datetime or None, 'est_minutes' : int or None, 'importance' : 2|1|0|None}
+def parse_task(text, reference=None, nlp=None):
+    """Parse a task string and return a Task
+    (raw : original text, title : short title, due : datetime or None, est_minutes : int or None, importance : 2|1|0|None)
+    `nlp` lets callers inject their own pipeline, default is the shared one.
+    With the shared pipeline results are cached per (text, reference minute) and relative
+    dates resolve against that minute; injected pipelines are never cached.
     """
-    
+
     if not text or not text.strip():
         return None
-    
+
+    if nlp is not None:
+        return parse_task_from_doc(text, nlp(text), reference)
+    reference = (reference or datetime.now()).replace(second=0, microsecond=0)
+    return _parse_task_cached(text, reference)
+
+@functools.lru_cache(maxsize=4096)
+def _parse_task_cached(text, reference):
+    return parse_task_from_doc(text, get_nlp()(text), reference)
+
+def parse_task_from_doc(text, doc, reference=None):
+    """Same as parse_task but reuses an already processed spaCy doc,
+    e.g. one produced by nlp.pipe() when parsing many tasks at once.
+    """
+
+    if not text or not text.strip():
+        return None
+
     reference = reference or datetime.now()
+    # lowercase once, all the keyword/date/time regexes scan this copy case-sensitively
+    lowered = text.lower()
     
-    # parse date (dateparser handles natural language)
+    # parse date: cheap regex fast path first, dateparser handles the rest of natural language
     # Use RELTIVE_BASE so tomorrow or next_tue is reltive to reference
-    
-    try:
-        due = dateparser.parse(text, settings={'RELATIVE_BASE': reference, 'PREFER_DATES_FROM': 'future'})
-    except Exception:
-        due = None
+    due = fast_parse_due(lowered, reference)
+    if due is None:
+        span = DATE_SPAN_RE.search(lowered)
+        try:
+            due = _get_dateparser().parse(span.group(0) if span else text,
+                                          settings={'RELATIVE_BASE': reference, 'PREFER_DATES_FROM': 'future'})
+        except Exception:
+            due = None
         
     
     # estimate minutes using regex for time mentions
     est_minutes = None
-    m = TIME_RE.search(text)
+    m = TIME_RE.search(lowered)
     if m:
         val = int(m.group(1))
-        unit = m.group(2).lower()
+        unit = m.group(2)
         
         if unit.startswith('h'):
             est_minutes = val  * 60
         else:
             est_minutes = val
     
-    # infer importance from keywords
-    lowered = text.lower()
+    # infer importance from keywords (high wins over medium, medium over low)
+    found = {m.lastgroup for m in IMP_RE.finditer(lowered)}
     importance = None
-    if any(w in lowered for w in HIGH_WORDS):
+    if 'H' in found:
         importance = 0
-    elif any(w in lowered for w in MED_WORDS):
+    elif 'M' in found:
         importance = 1
-    elif any(w in lowered for w in LOW_WORDS):
+    elif 'L' in found:
         importance = -1
         
     
     # build a short title using spacy noun chuncks
-    doc = nlp(text)
     title = None
     
-    # Try 1 first noun chunck (clened)
-    noun_chunks = [chunk.text.strip() for chunk in doc.noun_chunks if len (chunk.text.strip()) > 2]
-    
-    if noun_chunks:
-        title = noun_chunks[0]
-    else:
+    # Try 1 first noun chunck (clened), stop at the first usable one
+    for chunk in doc.noun_chunks:
+        chunk_text = chunk.text.strip()
+        if len(chunk_text) > 2:
+            title = chunk_text
+            break
+
+    if title is None:
         # Try2: first Verb + object or first sentence
         verbs = [tok for tok in doc if tok.pos_ == 'VERB']
         if verbs:
@@ -86,17 +238,18 @@ def parse_task(text, reference=None):
         else:
             title = text.strip()
     
-    # clean text a bit: remove tralling commas/phrase like '~2h', or 'high importance
-    # remove parental content
-    title = re.sub(r'\(.*?\)|\[.*?\]', '', title).strip()
-    # remove commoon trailling fragments like ", ~2h"
-    title = re.sub(r',\s*~?\d+\s*(h|hr|hour|m|min).*', '', title, flags=re.IGNORECASE).strip()
+    # clean text a bit: remove parental content and trailling fragments like ", ~2h"
+    # (each pattern needs a ( [ or , so most short titles skip the regexes entirely)
+    if '(' in title or '[' in title:
+        title = TITLE_BRACKETS_RE.sub('', title).strip()
+    if ',' in title:
+        title = TITLE_TRAILING_RE.sub('', title).strip()
     
     #if title to loog, truncate
     if len(title) > 80:
         title = title[:77].rstrip() + '...'
     
-    return {'raw': text, 'title': title, 'due': due, 'est_minutes': est_minutes, 'importance': importance}
+    return Task(raw=text, title=title, due=due, est_minutes=est_minutes, importance=importance)
 
 # Small demo when running the file directly
 if __name__ == "__main__":
@@ -117,11 +270,11 @@ if __name__ == "__main__":
             parsed = parse_task(t)
             if parsed is not None:
                 print("-" * 60)
-                print("Raw:", parsed['raw'])
-                print("Title:", parsed['title'])
-                print("Due:", parsed['due'])
-                print("Est minutes:", parsed['est_minutes'])
-                print("Importance:", parsed['importance'])
+                print("Raw:", parsed.raw)
+                print("Title:", parsed.title)
+                print("Due:", parsed.due)
+                print("Est minutes:", parsed.est_minutes)
+                print("Importance:", parsed.importance)
             else:
                 print(f"Parsed is None for: '{t}'")
         except Exception as e:
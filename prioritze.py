@@ -8,20 +8,34 @@ Functions:
 - importance_score(imp) -> 0..1 (map 2/1/0/None)
 - time_score(est_minutes) -> 0..1 (shorter tasks get higher score)
 - score_task(task, ref=None, weights=(0.6,0.3,0.1)) -> priority 0..1
-- rank_tasks(tasks, ref=None, weights=(...)) -> list of (score, task) sorted desc
-
-Expected input `task` is a dict with keys produced by `parse_task()`:
-{
-  'raw': str,
-  'title': str,
-  'due': datetime or None,
-  'est_minutes': int or None,
-  'importance': 2|1|0|None
-}
+- rank_tasks(tasks, ref=None, weights=(...), top_k=None) -> list of (score, task) sorted desc
+  (same scoring as score_task, computed column-wise with NumPy for large inputs)
+
+Expected input `task` is a parser.Task produced by `parse_task()`
+(any object with these attributes works):
+  raw: str
+  title: str
+  due: datetime or None
+  est_minutes: int or None
+  importance: 2|1|0|None
 """
 
+from bisect import bisect_left, bisect_right
 from datetime import datetime
 import math
+import numpy as np
+
+# Piecewise tables shared by the scalar scores (bisect) and rank_tasks (np.searchsorted).
+# urgency: upper bounds are exclusive (days < X), days <= 0 is handled separately
+URG_THRESHOLDS = (0.0, 1.0, 3.0, 7.0, 30.0)
+URG_VALUES = (1.0, 0.95, 0.80, 0.60, 0.30, 0.05)
+# time: upper bounds are inclusive (minutes <= X)
+TIME_THRESHOLDS = (15.0, 60.0, 180.0)
+TIME_VALUES = (1.0, 0.8, 0.5, 0.2)
+# below this many tasks the plain NumPy path is faster than calling the JIT kernel
+NUMBA_MIN_TASKS = 1000
+# numba-compiled _score_rows, built lazily (False = numba not installed)
+_score_kernel = None
 
 def days_until(d, ref=None):
     """Return days (float) from ref until datetime d. If d is None return None."""
@@ -46,15 +60,7 @@ def urgency_score(days):
         return 0.0
     if days <= 0:
         return 1.0
-    if days < 1:
-        return 0.95
-    if days < 3:
-        return 0.80
-    if days < 7:
-        return 0.60
-    if days < 30:
-        return 0.30
-    return 0.05
+    return URG_VALUES[bisect_right(URG_THRESHOLDS, days)]
 
 def importance_score(imp):
     """
@@ -69,7 +75,7 @@ def importance_score(imp):
 def time_score(est_minutes):
     """
     Map estimated time to 0..1 where smaller tasks score higher (prefer short wins).
-    - None (unknown) -> 0.5 neutral
+    - None / NaN (unknown) -> 0.5 neutral
     - <=15m -> 1.0
     - <=60m -> 0.8
     - <=180m -> 0.5
@@ -81,27 +87,23 @@ def time_score(est_minutes):
         m = float(est_minutes)
     except Exception:
         return 0.5
-    if m <= 15:
-        return 1.0
-    if m <= 60:
-        return 0.8
-    if m <= 180:
+    if math.isnan(m):
         return 0.5
-    return 0.2
+    return TIME_VALUES[bisect_left(TIME_THRESHOLDS, m)]
 
 def score_task(task, ref=None, weights=(0.6, 0.3, 0.1)):
     """
-    Compute priority score in 0..1 for a parsed task dict.
+    Compute priority score in 0..1 for a parsed Task.
 
     Final raw score = urgency*W_urg + importance*W_imp + time_score*W_time
     Return normalized score in 0..1 by dividing by sum(weights) (so final in 0..1).
     """
-    # Defensive: accept either dict or None
+    # Defensive: accept either Task or None
     if task is None:
         return 0.0
 
     # Compute components
-    due = task.get('due')
+    due = task.due
     days = None
     if due is not None:
         try:
@@ -110,8 +112,8 @@ def score_task(task, ref=None, weights=(0.6, 0.3, 0.1)):
             days = None
 
     u = urgency_score(days)
-    imp = importance_score(task.get('importance'))
-    t = time_score(task.get('est_minutes'))
+    imp = importance_score(task.importance)
+    t = time_score(task.est_minutes)
 
     w_urg, w_imp, w_time = weights
     raw = (u * w_urg) + (imp * w_imp) + (t * w_time)
@@ -123,26 +125,159 @@ def score_task(task, ref=None, weights=(0.6, 0.3, 0.1)):
     # small numeric safety clamp
     return max(0.0, min(1.0, float(score)))
 
-def rank_tasks(tasks, ref=None, weights=(0.6,0.3,0.1)):
+def _to_float(value):
+    """float(value), or NaN when value is None / not numeric."""
+    if value is None:
+        return math.nan
+    try:
+        return float(value)
+    except Exception:
+        return math.nan
+
+def _score_columns(days, imp, est, w_urg, w_imp, w_time, denom):
+    """NumPy version of score_task over columns (NaN = missing)."""
+    # urgency_score
+    u = np.asarray(URG_VALUES)[np.searchsorted(URG_THRESHOLDS, days, side='right')]
+    u[days <= 0] = 1.0
+    u[np.isnan(days)] = 0.0
+    # importance_score (NaN / unknown values fall through to the 0.5 default)
+    i_s = np.select([imp == 0, imp == 1, imp == 2], [1.0, 0.5, 0.1], default=0.5)
+    # time_score
+    t_s = np.asarray(TIME_VALUES)[np.searchsorted(TIME_THRESHOLDS, est, side='left')]
+    t_s[np.isnan(est)] = 0.5
+    return np.clip((u * w_urg + i_s * w_imp + t_s * w_time) / denom, 0.0, 1.0)
+
+def _score_rows(days, imp, est, w_urg, w_imp, w_time, denom):
+    """Same rules as _score_columns, one row per iteration; compiled by _get_score_kernel."""
+    out = np.empty_like(days)
+    for i in range(days.shape[0]):
+        d = days[i]
+        if np.isnan(d):
+            u = 0.0
+        elif d <= 0:
+            u = 1.0
+        else:
+            j = 0
+            while j < len(URG_THRESHOLDS) and d >= URG_THRESHOLDS[j]:
+                j += 1
+            u = URG_VALUES[j]
+
+        p = imp[i]
+        if p == 0:
+            i_s = 1.0
+        elif p == 1:
+            i_s = 0.5
+        elif p == 2:
+            i_s = 0.1
+        else:
+            i_s = 0.5
+
+        m = est[i]
+        if np.isnan(m):
+            t_s = 0.5
+        else:
+            j = 0
+            while j < len(TIME_THRESHOLDS) and m > TIME_THRESHOLDS[j]:
+                j += 1
+            t_s = TIME_VALUES[j]
+
+        out[i] = min(max((u * w_urg + i_s * w_imp + t_s * w_time) / denom, 0.0), 1.0)
+    return out
+
+def _get_score_kernel():
+    """Return _score_rows compiled with numba.njit, or None when numba is not installed.
+    numba is imported here, on the first large input, since importing it takes a while.
+    Serial on purpose: parallel=True would need a thread-safe threading layer, and
+    Streamlit calls rank_tasks from one thread per session.
+    No fastmath: it would let LLVM assume NaN never happens and drop the isnan checks.
     """
-    Given an iterable of task dicts (parsed tasks), return list of tuples:
-    [(score, task_dict), ...] sorted descending by score.
+    global _score_kernel
+    if _score_kernel is None:
+        try:
+            import numba
+        except ImportError:
+            _score_kernel = False
+        else:
+            _score_kernel = numba.njit(cache=True)(_score_rows)
+    return _score_kernel if _score_kernel is not False else None
+
+def rank_tasks(tasks, ref=None, weights=(0.6,0.3,0.1), top_k=None):
+    """
+    Given an iterable of parsed Tasks, return list of tuples:
+    [(score, task), ...] sorted descending by score.
+    With top_k only the k best are returned (selected in O(n), only those get sorted).
+
+    Tasks are pulled into columns (days, importance, est_minutes, NaN = missing)
+    and scored with the same piecewise rules as score_task, vectorized
+    (JIT-compiled with numba instead when it is installed and the input is large).
     """
-    scored = []
-    for t in tasks:
-        s = score_task(t, ref=ref, weights=weights)
-        scored.append((s, t))
-    scored.sort(key=lambda x: x[0], reverse=True)
-    return scored
+    tasks = list(tasks)
+    if not tasks:
+        return []
+    ref = ref or datetime.now()
+
+    n = len(tasks)
+    valid = np.ones(n, dtype=bool)
+    days = np.full(n, np.nan)
+    imp = np.full(n, np.nan)
+    est = np.full(n, np.nan)
+    # naive datetimes are collected and turned into days in one datetime64 subtraction;
+    # anything else (tz-aware, other types) keeps the per-task days_until semantics
+    naive_ref = isinstance(ref, datetime) and ref.tzinfo is None
+    due_idx = []
+    due_vals = []
+    for i, t in enumerate(tasks):
+        if t is None:
+            valid[i] = False
+            continue
+        due = t.due
+        if due is not None:
+            if naive_ref and isinstance(due, datetime) and due.tzinfo is None:
+                due_idx.append(i)
+                due_vals.append(due)
+            else:
+                try:
+                    days[i] = days_until(due, ref)
+                except Exception:
+                    pass
+        imp[i] = _to_float(t.importance)
+        est[i] = _to_float(t.est_minutes)
+    if due_vals:
+        # microsecond resolution keeps the result identical to timedelta.total_seconds()
+        delta = np.array(due_vals, dtype='datetime64[us]') - np.datetime64(ref, 'us')
+        days[due_idx] = delta / np.timedelta64(1, 'us') / 1e6 / (3600.0 * 24.0)
+
+    w_urg, w_imp, w_time = (float(w) for w in weights)
+    denom = float(w_urg + w_imp + w_time) if (w_urg + w_imp + w_time) != 0 else 1.0
+    kernel = _get_score_kernel() if n >= NUMBA_MIN_TASKS else None
+    if kernel is not None:
+        score = kernel(days, imp, est, w_urg, w_imp, w_time, denom)
+    else:
+        score = _score_columns(days, imp, est, w_urg, w_imp, w_time, denom)
+    score[~valid] = 0.0
+
+    # stable, so equal scores keep their input order like list.sort did
+    if top_k is not None and top_k < n:
+        if top_k <= 0:
+            return []
+        # k-th best score in O(n); keep every tie with it so the stable sort
+        # below picks the same tasks a full sort would
+        kth = np.partition(score, n - top_k)[n - top_k]
+        candidates = np.flatnonzero(score >= kth)
+        order = candidates[np.argsort(-score[candidates], kind='stable')][:top_k]
+    else:
+        order = np.argsort(-score, kind='stable')
+    return [(float(score[i]), tasks[i]) for i in order]
 
 # ---------------- Demo when run as script ----------------
 if __name__ == "__main__":
-    # Quick demo using sample parsed-like objects (if you have parser.py,
-    # you can import parse_task and build tasks from free text.)
+    # Quick demo using sample parsed-like objects (you can also use
+    # parser.parse_task to build tasks from free text.)
     from datetime import timedelta
+    from parser import Task
     now = datetime.now()
 
-    demo_tasks = [
+    demo_tasks = [Task(**d) for d in [
         # due tomorrow, high importance, 120 min
         {'raw':'Finish slides for meeting next Tue, ~2h, high importance',
          'title':'Finish slides','due': now + timedelta(days=1),'est_minutes':120,'importance':2},
@@ -154,9 +289,9 @@ if __name__ == "__main__":
         {'raw':'Submit tax form','title':'Submit tax','due': now - timedelta(days=1),'est_minutes':30,'importance':2},
         # quick micro task, no due
         {'raw':'Quick email to Sarah','title':'Email Sarah','due': None,'est_minutes':10,'importance':None},
-    ]
+    ]]
 
     ranked = rank_tasks(demo_tasks, ref=now)
     print("Ranked tasks (score, title):")
     for score, t in ranked:
-        print(f"{score:.3f}  — {t['title']}  (due={t['due']}, est={t['est_minutes']}, imp={t['importance']})")
+        print(f"{score:.3f}  — {t.title}  (due={t.due}, est={t.est_minutes}, imp={t.importance})")
@@ -1,25 +1,65 @@
 # src/app_streamlit.py
+import os
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-from parser import parse_task
+from parser import load_nlp, parse_task_from_doc, pipe_by_length
 from prioritze import rank_tasks
 
 st.set_page_config(page_title="Assist", layout="wide")
+
+@st.cache_resource
+def get_nlp():
+    # keep one spaCy pipeline for the whole server instead of reloading per rerun
+    return load_nlp()
+
+# the key changes every hour anyway, so expire entries after one and cap the total
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=256)
+def parse_tasks(tasks, ref_hour, _reference):
+    # cached on the task texts + the hour they were parsed in; `_reference`
+    # (unhashed) is the exact time relative dates are resolved against. It is
+    # returned too so ranking uses the same instant, even on a cache hit
+    nlp = get_nlp()
+    batch_size = int(os.environ.get('SPACY_BATCH', '64'))
+    docs = pipe_by_length(nlp, tasks, batch_size)
+    return _reference, [parse_task_from_doc(t, d, _reference) for t, d in zip(tasks, docs)]
+
+def read_tasks_csv(uploaded):
+    # returns None when the CSV has no 'task' column (checked on the header alone,
+    # so other read errors are not mistaken for a missing column)
+    header = pd.read_csv(uploaded, nrows=0)
+    uploaded.seek(0)
+    if 'task' not in header.columns:
+        return None
+    # only the 'task' column is needed; the pyarrow engine parses much faster
+    # when pyarrow is installed, otherwise fall back to the default C engine
+    try:
+        return pd.read_csv(uploaded, engine='pyarrow', dtype_backend='pyarrow', usecols=['task'])
+    except (ImportError, TypeError):
+        # no pyarrow, or pandas < 2.0 which has no dtype_backend argument
+        uploaded.seek(0)
+        return pd.read_csv(uploaded, usecols=['task'])
+
 st.title("Smart Task Assistant")
 
 # textarea to paste multiple lines or single task
 input_text = st.text_area("Paste tasks (one per line) or type a task:", height=120)
 
 uploaded = st.file_uploader("Or upload a CSV file with a 'task' column", type=["csv"])
+top_k = st.number_input("Show top N tasks (0 = all)", min_value=0, value=0, step=1)
 tasks = []
 
 if uploaded:
-    df = pd.read_csv(uploaded)
-    if 'task' in df.columns:
-        tasks = df['task'].astype(str).tolist()
+    try:
+        df = read_tasks_csv(uploaded)
+    except ValueError as e:
+        # malformed / non-UTF-8 files (ParserError, ArrowInvalid, UnicodeDecodeError, ...)
+        st.error(f"Could not read CSV: {e}")
     else:
-        st.error("CSV must contain a 'task' column")
+        if df is None:
+            st.error("CSV must contain a 'task' column")
+        else:
+            tasks = df['task'].dropna().astype(str).tolist()
 
 if input_text:
     tasks += [line.strip() for line in input_text.splitlines() if line.strip()]
@@ -28,18 +68,21 @@ if st.button("Parse & Rank"):
     if not tasks:
         st.info("Add tasks via text area or upload a CSV.")
     else:
-        parsed = [parse_task(t) for t in tasks]
-        ranked = rank_tasks(parsed, ref=datetime.now())
+        now = datetime.now()
+        # run spaCy over all tasks in one batch, then the cheap per-task logic
+        with st.spinner("Parsing tasks..."):
+            ref, parsed = parse_tasks(tuple(tasks), now.replace(minute=0, second=0, microsecond=0), now)
+        ranked = rank_tasks(parsed, ref=ref, top_k=int(top_k) or None)
         rows = []
         for score, t in ranked:
             rows.append({
                 'score': round(float(score), 4),
-                'title': t.get('title'),
-                'due': t.get('due'),
-                'est_minutes': t.get('est_minutes'),
-                'importance': t.get('importance'),
-                'raw': t.get('raw')
+                'title': t.title,
+                'due': t.due,
+                'est_minutes': t.est_minutes,
+                'importance': t.importance,
+                'raw': t.raw
             })
-        st.table(pd.DataFrame(rows))
-        csv = pd.DataFrame(rows).to_csv(index=False)
-        st.download_button("Download CSV", csv, file_name="tasks_ranked.csv")
+        df_out = pd.DataFrame(rows)
+        st.table(df_out)
+        st.download_button("Download CSV", df_out.to_csv(index=False), file_name="tasks_ranked.csv")